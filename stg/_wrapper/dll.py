@@ -1,7 +1,11 @@
-from pathlib import Path
 from sys import platform
-from typing import List, Union, Any, Callable
+from typing import List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
+from operator import or_
 from time import sleep
+from threading import RLock
+from weakref import finalize
 from abc import ABC, abstractmethod
 
 OptionalInt = Union[int, None]
@@ -65,11 +69,23 @@ def select(serialnumber: OptionalInt = None) -> Union[DeviceInfo, None]:
     return device
 
 
-def bitmap(valuelist: list):
-    bmap = sum(map(lambda x: 2 ** x, valuelist))
+@lru_cache(maxsize=256)
+def _bitmap(indices: Tuple[int, ...]):
+    bmap = reduce(or_, (1 << i for i in indices), 0)
     return None if bmap == 0 else bmap
 
 
+@lru_cache(maxsize=256)
+def _u32(index: int):
+    "box a small index, e.g. of a channel, as System.UInt32 only once"
+    return System.UInt32(index)
+
+
+def bitmap(valuelist: list):
+    "convert a list of indices into a bitmap, e.g. [0, 2] to 0b101"
+    return _bitmap(tuple(valuelist))
+
+
 # ------------------------------------------------------------------------------
 class BasicInterface(ABC):
     """Implements the `with` syntax for connecting to a CStg200xDownloadNet or CStg200xStreamingNet
@@ -149,11 +165,12 @@ class STGX(ABC):
 
     Immediatly after the connection is established, we eagerly read all properties from the stimulator, e.g. the number of channels or the output resolution. This read-only properties are than cached, to prevent any later overhead. This means it might take a few seconds until the :code:`stg` is initialized, but it saves you precious milliseconds when you later stimulate.
 
-    Because at any time, only one process can be connected with a specific STG the connection is implemented using a :code:`with ... as` idiom. This should therefore be relatively safe. It is still possible that the STG can get into a weird state. In that case, try turning it off and on again.
+    The connection to the STG is opened once and then kept open for all later calls, which saves reconnecting with every single command. Because at any time, only one process can be connected with a specific STG, release the connection with :meth:`~.close` when you are done, or use the :code:`with ... as` idiom, e.g. :code:`with STG4000() as stg:`. It is still possible that the STG can get into a weird state. In that case, try turning it off and on again.
 
     .. note::
 
         * Properties are eagerly loaded and cached during initalization
+        * The connection stays open until :meth:`~.close` is called or the object is garbage collected
     """
 
     def __init__(self, serial: OptionalInt = None):
@@ -166,54 +183,92 @@ class STGX(ABC):
                 )
         else:  # pragma no cover
             info = select(serial)
-        print(
-            "Selecting {0:s}:SN {1:s}".format(
-                info.DeviceName, info.SerialNumber
-            )
-        )
         self._info = info
-        self._collect_properties()
-        self.diagonalize_triggermap()
+        # constant for the lifetime of the device, so we convert the .NET
+        # values only once into Python objects
+        self._str = str(info.ToString())
+        self._name = str(info.DeviceName)
+        self._manufacturer = str(info.Manufacturer)
+        self._serial_number = int(info.SerialNumber)
+        print("Selecting {0:s}:SN {1:d}".format(self._name, self._serial_number))
+        self._connection = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = RLock()
+        try:
+            self._collect_properties()
+            self.diagonalize_triggermap()
+        except Exception:
+            # do not keep the STG blocked by a half-initialized object
+            self.close()
+            raise
 
     def _collect_properties(self):
-        self._str = self._info.ToString()
-        self._name = self._info.DeviceName
-        self._manufacturer = self._info.Manufacturer
-        with self.interface() as interface:
-            _, soft, hard = interface.GetStgVersionInfo("", "")
-            self._version = (soft, hard)
-            self._serial_number = int(self._info.SerialNumber)
-            self._crinua = (
-                interface.GetCurrentResolutionInNanoAmp(System.UInt32(0))
-                / 1000
-            )
-            self._crinma = interface.GetCurrentResolutionInNanoAmp(
-                System.UInt32(0)
-            ) / (1000 * 1000)
-            self._crngma = interface.GetCurrentRangeInNanoAmp(
-                System.UInt32(0)
-            ) / (1000 * 1000)
-            self._crngua = interface.GetCurrentRangeInNanoAmp(
-                System.UInt32(0)
-            ) / (1000)
-            self._vinuv = interface.GetVoltageResolutionInMicroVolt(
-                System.UInt32(0)
-            )
-            self._vrnguv = interface.GetVoltageRangeInMicroVolt(
-                System.UInt32(0)
-            ) / (1000)
-            self._dacr = interface.GetDACResolution()
-            self._achancnt = interface.GetNumberOfAnalogChannels()
-            self._trgincnt = interface.GetNumberOfTriggerInputs()
+        interface = self._session()
+        _, soft, hard = interface.GetStgVersionInfo("", "")
+        self._version = (soft, hard)
+        # query each value only once and derive the other units from it
+        resolution_in_nA = interface.GetCurrentResolutionInNanoAmp(_u32(0))
+        range_in_nA = interface.GetCurrentRangeInNanoAmp(_u32(0))
+        self._crinua = resolution_in_nA / 1000
+        self._crinma = resolution_in_nA / (1000 * 1000)
+        self._crngma = range_in_nA / (1000 * 1000)
+        self._crngua = range_in_nA / 1000
+        self._vinuv = interface.GetVoltageResolutionInMicroVolt(_u32(0))
+        self._vrnguv = interface.GetVoltageRangeInMicroVolt(_u32(0)) / (1000)
+        self._dacr = interface.GetDACResolution()
+        self._achancnt = interface.GetNumberOfAnalogChannels()
+        self._trgincnt = interface.GetNumberOfTriggerInputs()
+        self._all_trigger_bitmap = (1 << self._achancnt) - 1
+        self._diagonal_map = [1 << chan for chan in range(self._achancnt)]
+        self._diagonal_repeat = [1] * self._achancnt  # every trigger only once
+
+    def invalidate(self):
+        """re-read all cached properties from the stimulator
+
+        Properties are read only once during initialization. Use this method to force a re-read, e.g. after the device was reconfigured.
+        """
+        with self._lock:
+            self._collect_properties()
 
     @abstractmethod
     def diagonalize_triggermap(self):  # pragma no cover
         pass
 
     def interface(self):  # pragma no cover
+        "returns a new, unconnected interface. Only used by :meth:`~._session`"
         return DownloadInterface(self._info)
 
-    def sleep(self, duration_in_ms: float):
+    def _session(self):
+        "returns the persistent interface, connecting on first use"
+        if self._connection is None:
+            connection = self.interface().__enter__()
+            # disconnect even if the object is garbage collected without close
+            self._finalizer = finalize(self, connection.__exit__, None, None, None)
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        "close the connection with the STG, if one is open"
+        with self._lock:
+            executor, self._executor = self._executor, None
+        # the worker needs the lock to finish pending downloads, so we must
+        # not hold it while waiting for the executor to shut down
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            if self._connection is not None:
+                self._finalizer.detach()
+                self._connection.__exit__(None, None, None)
+                self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, tb):
+        self.close()
+
+    @staticmethod
+    def sleep(duration_in_ms: float):
         "sleep for duration in milliseconds"
         sleep(duration_in_ms / 1000)
 
@@ -301,39 +356,38 @@ class STGX(ABC):
     def __str__(self) -> str:
         return self._str
 
-    def _set_current_mode(self, channel_index: List[int] = []):
-        """set a single or all channels to current mode
-        
-        args
-        ----
-        channel_index:list
-            defaults to all, which sets all channels to current mode
-            otherwise, takes an integer of the target channel.
-            Indexing starts at 0.        
-        """
-        if channel_index == []:
-            with self.interface() as interface:
-                interface.SetCurrentMode()
-        else:
-            with self.interface() as interface:
-                for chan in channel_index:
-                    interface.SetCurrentMode(System.UInt32(chan))
-
-    def _set_voltage_mode(self, channel_index: List[int] = []):
-        """set a single or all channels to voltage mode
+    def _set_mode(
+        self, interface, channel_index: List[int] = [], mode: str = "current"
+    ) -> int:
+        """set a single or all channels to voltage or current mode
         
         args
         ----
+        interface:
+            an already connected interface, e.g. from :code:`self._session()`
         channel_index:list
-            defaults to all, which sets all channels to voltage mode
-            otherwise, takes an integer of the target channel.
+            defaults to all, which sets all channels to the mode
+            otherwise, takes a list of integers of the target channels.
             Indexing starts at 0.
-        
+        mode: str ("current", "voltage")
+            defaults to current
+
+        returns
+        -------
+        mode: int
+            the CURRENT or VOLTAGE flag expected by the DLL
         """
+        if mode == "current":
+            setter, MODE = interface.SetCurrentMode, CURRENT
+        elif mode == "voltage":
+            setter, MODE = interface.SetVoltageMode, VOLTAGE
+        else:  # pragma no cover
+            raise ValueError(
+                f"Unknow mode {mode}. select either 'current' or ' 'voltage'"
+            )
         if channel_index == []:
-            with self.interface() as interface:
-                interface.SetVoltageMode()
+            setter()
         else:
-            with self.interface() as interface:
-                for chan in channel_index:
-                    interface.SetVoltageMode(System.UInt32(chan))
+            for chan in channel_index:
+                setter(_u32(chan))
+        return MODE
@@ -1,16 +1,26 @@
 # -*- coding: utf-8 -*-
-from typing import List
-from stg._wrapper.dll import (
-    System,
-    CURRENT,
-    VOLTAGE,
-    available,
-    select,
-    DeviceInfo,
-    StreamingInterface,
-    bitmap,
-    STGX,
-)
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+from stg._wrapper.dll import System, bitmap, _u32, STGX
+
+
+def _scale(values: List[float], factor: int) -> List[int]:
+    "multiply all values by factor and round them to the nearest int"
+    return [round(v * factor) for v in values]
+
+
+def _marshal(amplitudes_in_mA: List[float], durations_in_ms: List[float]):
+    """validate a signal and convert it into the arrays expected by the DLL
+
+    The lengths are checked before anything is converted. Each list is then
+    marshalled in a single call, instead of boxing every element into a CLR
+    value type one by one.
+    """
+    if len(amplitudes_in_mA) != len(durations_in_ms):
+        raise ValueError("Every amplitude needs a duration and vice versa!")
+    amplitudes = System.Array[System.Int32](_scale(amplitudes_in_mA, 1000_000))
+    durations = System.Array[System.UInt64](_scale(durations_in_ms, 1000))
+    return amplitudes, durations
 
 
 class STG4000(STGX):
@@ -28,12 +38,12 @@ class STG4000(STGX):
         import time
         from stg.api import STG4000
         
-        stg = STG4000()
-        stg.download(0,[1,-1, 0], [0.1, 0.1, 49.8])
-        while True:
-            time.sleep(0.5)    
-            a.trigger()
-            stg.start_stimulation([0])
+        with STG4000() as stg:
+            stg.download(0,[1,-1, 0], [0.1, 0.1, 49.8])
+            while True:
+                time.sleep(0.5)    
+                a.trigger()
+                stg.start_stimulation([0])
 
     .. note::
        
@@ -56,10 +66,12 @@ class STG4000(STGX):
         
         """
 
-        if triggerIndex == []:
-            triggerIndex = [c for c in range(self.channel_count)]
-        with self.interface() as interface:
-            interface.SendStop(System.UInt32(bitmap(triggerIndex)))
+        if not triggerIndex:
+            bmap = self._all_trigger_bitmap
+        else:
+            bmap = bitmap(triggerIndex)
+        with self._lock:
+            self._session().SendStop(_u32(bmap))
 
     def start_stimulation(self, triggerIndex: List[int] = []):
         """starts all trigger inputs or a selection based on a list 
@@ -71,10 +83,12 @@ class STG4000(STGX):
         
         """
 
-        if triggerIndex == []:
-            triggerIndex = [c for c in range(self.channel_count)]
-        with self.interface() as interface:
-            interface.SendStart(System.UInt32(bitmap(triggerIndex)))
+        if not triggerIndex:
+            bmap = self._all_trigger_bitmap
+        else:
+            bmap = bitmap(triggerIndex)
+        with self._lock:
+            self._session().SendStart(_u32(bmap))
 
     def set_mode(self, channel_index: List[int] = [], mode: str = "current") -> int:
         """set a single or all channels to voltage or current mode
@@ -93,16 +107,8 @@ class STG4000(STGX):
         
 
         """
-        if mode == "current":
-            self._set_current_mode(channel_index)
-            return CURRENT
-        elif mode == "voltage":
-            self._set_voltage_mode(channel_index)
-            return VOLTAGE
-        else:  # pragma no cover
-            raise ValueError(
-                f"Unknow mode {mode}. select either 'current' or ' 'voltage'"
-            )
+        with self._lock:
+            return self._set_mode(self._session(), channel_index, mode)
 
     def diagonalize_triggermap(self):
         """Give each trigger a sensible channel
@@ -116,15 +122,11 @@ class STG4000(STGX):
             +----------+---+---+---+---+---+---+---+---+
         
         """
-        channelmap = []
-        syncoutmap = []
-        repeat = []
-        for chan_idx in range(0, self.channel_count):
-            repeat.append(1)  # every trigger only once
-            syncoutmap.append(1 << chan_idx)  # diagonal triggerout
-            channelmap.append(1 << chan_idx)  # diagonal triggerin
-        with self.interface() as interface:
-            interface.SetupTrigger(0, channelmap, syncoutmap, repeat)
+        # diagonal triggerin and triggerout, computed once with the properties
+        diagonal = self._diagonal_map
+        with self._lock:
+            interface = self._session()
+            interface.SetupTrigger(0, diagonal, diagonal, self._diagonal_repeat)
 
     def download(
         self,
@@ -166,14 +168,95 @@ class STG4000(STGX):
            
     
         """
-        if len(amplitudes_in_mA) != len(durations_in_ms):
-            raise ValueError("Every amplitude needs a duration and vice versa!")
-
-        amplitudes = [System.Int32(a * 1000_000) for a in amplitudes_in_mA]
-        durations = [System.UInt64(s * 1000) for s in durations_in_ms]
+        amplitudes, durations = _marshal(amplitudes_in_mA, durations_in_ms)
+        self._send(channel_index, amplitudes, durations, mode)
 
-        MODE = self.set_mode([channel_index], mode)
-        with self.interface() as interface:
+    def _send(self, channel_index: int, amplitudes, durations, mode: str):
+        "set the mode of a channel and send already marshalled data to it"
+        with self._lock:
+            interface = self._session()
+            MODE = self._set_mode(interface, [channel_index], mode)
             interface.PrepareAndSendData(
-                System.UInt32(channel_index), amplitudes, durations, MODE
+                _u32(channel_index), amplitudes, durations, MODE
+            )
+
+    def download_many(
+        self,
+        signals: List[Tuple[int, List[float], List[float]]],
+        mode="current",
+    ):
+        """Download stimulation signals for several channels at once
+
+        .. Warning::
+
+           Any previous data sent to these channels is erased. Other channels stay untouched.
+
+        Compared to calling :meth:`~.download` for each channel, the mode of all channels is set in one go, and all signals are sent back-to-back through the same connection.
+
+        args
+        ----
+        signals: List[Tuple[int, List[float], List[float]]]
+            a list of tuples of channel_index, amplitudes_in_mA and durations_in_ms, each as in :meth:`~.download`
+        mode: str
+            defaults to current. Applies to all channels in signals
+
+        Example
+        -------
+
+        .. code-block:: python
+
+           stg.download_many([(0, [1, -1, 0], [.1, .1, .488]),
+                              (1, [2, -2, 0], [.1, .1, .488])])
+
+        """
+        # validate all signals first, so nothing is sent if one is malformed
+        marshalled = [
+            (channel_index, *_marshal(amplitudes_in_mA, durations_in_ms))
+            for channel_index, amplitudes_in_mA, durations_in_ms in signals
+        ]
+        if not marshalled:
+            # an empty channel list would set the mode of all channels
+            return
+        with self._lock:
+            interface = self._session()
+            MODE = self._set_mode(interface, [c for c, _, _ in marshalled], mode)
+            for channel_index, amplitudes, durations in marshalled:
+                interface.PrepareAndSendData(
+                    _u32(channel_index), amplitudes, durations, MODE
+                )
+
+    def download_async(
+        self,
+        channel_index: int = 0,
+        amplitudes_in_mA: List[float,] = [0],
+        durations_in_ms: List[float,] = [0],
+        mode="current",
+    ) -> Future:
+        """Download a stimulation signal in a background thread
+
+        Takes the same arguments as :meth:`~.download`, but returns immediately. The signal is validated and converted before this method returns, so you can reuse and modify your lists right away. Downloads are then sent one after the other from a single worker thread, so you can prepare the next signal while the previous one is still transferred over USB.
+
+        returns
+        -------
+        future: concurrent.futures.Future
+            resolves when the download finished. Call :code:`future.result()` to wait for it and to raise any exception that occured while sending.
+
+        Example
+        -------
+
+        .. code-block:: python
+
+           futures = [stg.download_async(c, [1, -1, 0], [.1, .1, .488])
+                      for c in range(stg.channel_count)]
+           for future in futures:
+               future.result()
+           stg.start_stimulation()
+
+        """
+        amplitudes, durations = _marshal(amplitudes_in_mA, durations_in_ms)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            return self._executor.submit(
+                self._send, channel_index, amplitudes, durations, mode
             )
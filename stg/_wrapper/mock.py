@@ -38,6 +38,8 @@ STG_DestinationEnumNet = _mock
 System = MagicMock()
 System.UInt32 = int
 System.Int16 = int
+System.Int32 = int
+System.UInt64 = int
 System.Array = list
 
 
@@ -1,12 +1,6 @@
 import threading
-from typing import List, Dict, Callable
-from stg._wrapper.dll import (
-    StreamingInterface,
-    CStg200xStreamingNet,
-    System,
-    STGX,
-    DeviceInfo,
-)
+from typing import List
+from stg._wrapper.dll import StreamingInterface, System, _u32
 from stg._wrapper.downloadnet import STG4000 as STG4000DL
 from stg.pulsefile import decompress
 import time
@@ -42,10 +36,10 @@ def diagonalize_triggermap(device, callback_percent: int = 10):
     autostart = []
     callback_threshold = []
     for i in range(nTrigger):
-        cmap.append(System.UInt32(1 << i))
-        syncmap.append(System.UInt32(0 << i))  # no syncout
-        digoutmap.append(System.UInt32(1 << i))
-        autostart.append(System.UInt32(0))  #
+        cmap.append(_u32(1 << i))
+        syncmap.append(_u32(0 << i))  # no syncout
+        digoutmap.append(_u32(1 << i))
+        autostart.append(_u32(0))  #
         callback_threshold.append(System.UInt32(callback_percent))  # 10% of buffersize
 
     device.SetupTrigger(cmap, syncmap, digoutmap, autostart, callback_threshold)
@@ -107,14 +101,14 @@ class STG4000Streamer(STG4000DL):
        buffer_in_s=0.05 # how large is the buffer in the DLL?       
        capacity_in_s=.1 # how large is the buffer on the STG?
 
-       stg = STG4000()              
-       stg.start_streaming(capacity_in_s=capacity_in_s, 
-                           buffer_in_s=buffer_in_s)
-       while True:
-           stg.set_signal(0, amplitudes_in_mA=[0], durations_in_ms=[.1])
-           time.sleep(0.5)    
-           stg.set_signal(0, amplitudes_in_mA=[1, -1, 0], durations_in_ms=[.1, .1, 49.7])
-           time.sleep(buffer_in_s / 2)  
+       with STG4000() as stg:
+           stg.start_streaming(capacity_in_s=capacity_in_s, 
+                               buffer_in_s=buffer_in_s)
+           while True:
+               stg.set_signal(0, amplitudes_in_mA=[0], durations_in_ms=[.1])
+               time.sleep(0.5)    
+               stg.set_signal(0, amplitudes_in_mA=[1, -1, 0], durations_in_ms=[.1, .1, 49.7])
+               time.sleep(buffer_in_s / 2)  
 
     .. warning::
     
@@ -194,7 +188,7 @@ class STG4000Streamer(STG4000DL):
             time.sleep(1)
             nTrigger = device.GetNumberOfTriggerInputs()
             for i in range(nTrigger):
-                device.SendStart(System.UInt32(i))
+                device.SendStart(_u32(i))
             # everything is prepared. we release the barrier, so that
             # the caller, i.e. start_streaming, may return now.
             barrier.wait()
@@ -215,7 +209,7 @@ class STG4000Streamer(STG4000DL):
                 print(f"Exception: {repr(e)}")
             finally:
                 for i in range(nTrigger):
-                    device.SendStop(System.UInt32(i))
+                    device.SendStop(_u32(i))
                 device.StopLoop()
                 device.Disconnect()
 
@@ -239,6 +233,8 @@ class STG4000Streamer(STG4000DL):
             at what state of the DLL-buffer the DLL should request new data. Should have no effect in this implementation, because we constanly push data into the buffer as soon as there is enough space.
         
         """
+        # only one connection with the STG can be open at any time
+        self.close()
         barrier = threading.Barrier(2)
         self._streaming.set()
         self._t = threading.Thread(
@@ -50,3 +50,5 @@ while True:
     time.sleep(buffer_in_s * callback_percent / 100)
 
 # %%
+# release the connection with the STG
+stg.close()
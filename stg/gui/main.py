@@ -148,6 +148,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def closeEvent(self, event):
         self.fuse()
+        self.device.close()
 
 
 # %%
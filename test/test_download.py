@@ -13,6 +13,7 @@ def stg():
     stg = STG4000()
     print(stg, stg.version)
     yield stg
+    stg.close()
 
 
 @pytest.mark.download
@@ -60,3 +61,22 @@ def test_start_stop_all(stg):
     stg.start_stimulation()
     stg.stop_stimulation()
 
+
+def test_mismatched_download_many(stg, monkeypatch):
+    def fail(*args, **kwargs):  # pragma no cover
+        raise AssertionError("nothing should be sent")
+
+    monkeypatch.setattr(stg, "_session", fail)
+    with pytest.raises(ValueError):
+        stg.download_many([(0, [1, 0], [0.1, 0.1]), (1, [1, 0], [0])])
+
+
+def test_download_async(stg):
+    futures = [
+        stg.download_async(c, [1, -1, 0], [0.1, 0.1, 0.488])
+        for c in range(stg.channel_count)
+    ]
+    for future in futures:
+        assert future.result() is None
+    with pytest.raises(ValueError):
+        stg.download_async(0, amplitudes_in_mA=[1, 0], durations_in_ms=[0])
@@ -1,7 +1,9 @@
+import gc
 from stg._wrapper.mock import CStg200xMockNet, _mock, DeviceInfo
-from stg._wrapper.dll import BasicInterface, MockingInterface
+from stg._wrapper.dll import BasicInterface, MockingInterface, bitmap
 import pytest
 from stg._wrapper.streamingnet import STG4000Streamer
+from stg._wrapper.downloadnet import _scale
 
 
 def test_basic_interface(capsys):
@@ -32,6 +34,7 @@ def stg(monkeypatch):
     monkeypatch.setattr(STG4000Streamer, "streamer", monkey)
     stg = STG4000Streamer(-1)
     yield stg
+    stg.close()
 
 
 def test_repr(stg):
@@ -65,3 +68,120 @@ def test_properties(stg, field, value):
 def test_set_mode(stg):
     stg.set_mode(mode="current")
     stg.set_mode(mode="voltage")
+
+
+def test_invalidate(stg, monkeypatch):
+    monkeypatch.setattr(CStg200xMockNet, "GetNumberOfAnalogChannels", lambda self: 8)
+    assert stg.channel_count == 2
+    stg.invalidate()
+    assert stg.channel_count == 8
+
+
+def test_close(stg, capsys):
+    stg._session()
+    with stg:
+        pass
+    assert stg._connection is None
+    assert "MOCK:DISCONNECT" in capsys.readouterr().out
+    stg.close()
+
+
+def test_all_trigger_bitmap(stg, monkeypatch):
+    sent = []
+    monkeypatch.setattr(CStg200xMockNet, "SendStart", lambda self, b: sent.append(b))
+    monkeypatch.setattr(CStg200xMockNet, "SendStop", lambda self, b: sent.append(b))
+    stg.start_stimulation()
+    stg.stop_stimulation()
+    stg.start_stimulation([1])
+    assert sent == [0b11, 0b11, 0b10]
+
+
+@pytest.mark.parametrize(
+    "valuelist, bmap", [([], None), ([0], 1), ([0, 2], 5), ([1, 1], 2)]
+)
+def test_bitmap(valuelist, bmap):
+    assert bitmap(valuelist) == bmap
+
+
+def test_connection_is_reused(stg, capsys):
+    stg.close()
+    capsys.readouterr()
+    stg.start_stimulation([0])
+    stg.stop_stimulation([0])
+    assert capsys.readouterr().out.count("MOCK:CONNECT") == 1
+
+
+def test_finalize_disconnects(monkeypatch, capsys):
+    def monkey(*args, **kwargs):
+        return MockingInterface(DeviceInfo)
+
+    monkeypatch.setattr(STG4000Streamer, "interface", monkey)
+    stg = STG4000Streamer(-1)
+    capsys.readouterr()
+    del stg
+    gc.collect()
+    assert "MOCK:DISCONNECT" in capsys.readouterr().out
+
+
+def test_init_failure_disconnects(monkeypatch, capsys):
+    def monkey(*args, **kwargs):
+        return MockingInterface(DeviceInfo)
+
+    def fail(self):
+        raise OSError("device vanished")
+
+    monkeypatch.setattr(STG4000Streamer, "interface", monkey)
+    monkeypatch.setattr(CStg200xMockNet, "GetDACResolution", fail)
+    with pytest.raises(OSError):
+        STG4000Streamer(-1)
+    assert "MOCK:DISCONNECT" in capsys.readouterr().out
+
+
+def test_scale_rounds():
+    assert _scale([1.005], 1000) == [1005]
+    assert _scale([1.005, -1.005], 1000_000) == [1005000, -1005000]
+
+
+def test_download_async_copies_signal(stg, monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        CStg200xMockNet,
+        "PrepareAndSendData",
+        lambda self, chan, amps, durs, mode: sent.append(list(amps)),
+    )
+    amps = [1, -1, 0]
+    with stg._lock:  # keep the worker busy until we modified the list
+        future = stg.download_async(0, amps, [0.1, 0.1, 0.488])
+        amps[0] = 5
+    future.result()
+    assert sent == [[1_000_000, -1_000_000, 0]]
+
+
+def test_download_many(stg, monkeypatch):
+    modes, sent = [], []
+    monkeypatch.setattr(
+        CStg200xMockNet, "SetCurrentMode", lambda self, *args: modes.append(args)
+    )
+    monkeypatch.setattr(
+        CStg200xMockNet,
+        "PrepareAndSendData",
+        lambda self, chan, amps, durs, mode: sent.append((chan, amps, durs)),
+    )
+    stg.download_many(
+        [(0, [1, -1, 0], [0.1, 0.1, 0.488]), (1, [2, -2, 0], [0.1, 0.1, 0.488])]
+    )
+    assert modes == [(0,), (1,)]
+    assert sent == [
+        (0, [1_000_000, -1_000_000, 0], [100, 100, 488]),
+        (1, [2_000_000, -2_000_000, 0], [100, 100, 488]),
+    ]
+
+
+def test_download_many_empty(stg, monkeypatch):
+    def fail(*args, **kwargs):  # pragma no cover
+        raise AssertionError("no mode should be set")
+
+    monkeypatch.setattr(CStg200xMockNet, "SetCurrentMode", fail)
+    monkeypatch.setattr(CStg200xMockNet, "SetVoltageMode", fail)
+    stg.download_many([])
+    stg.download_many([], mode="voltage")